@@ -1,15 +1,31 @@
 import sys
 import os
-import threading
+import atexit
+import queue
+import contextlib
+import hashlib
+import itertools
+import multiprocessing
 import tempfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTextEdit, QPushButton, QLabel, QFileDialog, QMessageBox,
     QCheckBox, QLineEdit, QListWidget, QListWidgetItem, QMenu
 )
-from PySide6.QtCore import Signal, QObject, Qt
-from PySide6.QtGui import QIcon, QKeySequence
-from pdf_engine import create_pdf_page, merge_pdfs
+from PySide6.QtCore import Signal, QObject, QRunnable, QThread, QThreadPool, QBuffer, QIODevice, Qt
+from PySide6.QtGui import QIcon, QImage, QImageReader, QImageWriter, QKeySequence, QPixmap
+from pdf_engine import create_pdf_page, warm_up, PdfSession
+
+# --- Render/merge pipeline ---
+# Render workers hand finished pages to the merger thread through this bounded
+# queue. When the merger falls behind, put() blocks the render worker (never
+# the GUI thread) instead of letting temporary pages pile up.
+_merge_queue = queue.Queue(maxsize=4)
+# Queued by the Save button to have the merger write its session to disk.
+_SAVE_REQUEST = object()
 
 # --- Communication object for worker thread ---
 class WorkerSignals(QObject):
@@ -17,34 +33,51 @@ class WorkerSignals(QObject):
     Defines the signals available from a running worker thread.
 
     Supported signals are:
-    - finished: Emits a string to indicate task completion or error.
+    - finished: Emits the job id and a string to indicate task completion or error.
+    - render_process_died: Emitted when the render process has crashed and
+      has to be replaced.
     """
-    finished = Signal(str)
+    finished = Signal(int, str)
+    render_process_died = Signal()
 
-class PdfWorker(QObject):
+class PdfWorker(QRunnable):
     """
-    Runs the PDF creation and merging process in a separate thread.
+    Renders a new PDF page on the global thread pool.
 
     This worker prevents the GUI from freezing during I/O-intensive operations.
-    It communicates its status back to the main thread via signals.
+    The CPU-bound part of rendering runs in a separate process (render_pool),
+    so it never competes with the GUI thread for the GIL; the worker thread
+    just waits for the result.
+    It only renders the page; the result is queued for the MergerThread, so the
+    next page can be rendered while the previous one is still being merged.
+    Being a QRunnable it is not a QObject itself, so it communicates its status
+    back to the main thread through its WorkerSignals instance.
 
     Args:
+        job_id (int): Identifies the page in the signals of both threads.
         user_text (str): The text from the user message input.
         model_text (str): The text from the model response input.
-        image_paths (list): A list of paths to the images to be added.
-        temp_files (list): A list of temporary files to be cleaned up.
+        image_paths (tuple): The paths to the images to be added.
         main_pdf_path (str): The absolute path to the main PDF file.
         show_headings (bool): If True, headings will be added to the PDF.
         user_heading (str): The heading for the user message section.
         model_heading (str): The heading for the model response section.
+        render_pool (ProcessPoolExecutor): The process pool that renders the page.
     """
-    def __init__(self, user_text, model_text, image_paths, temp_files, main_pdf_path, show_headings, user_heading, model_heading):
+    __slots__ = (
+        "signals", "render_pool", "job_id", "user_text", "model_text", "image_paths",
+        "main_pdf_path", "show_headings", "user_heading", "model_heading",
+    )
+
+    def __init__(self, job_id, user_text, model_text, image_paths, main_pdf_path, show_headings, user_heading, model_heading, render_pool):
         super().__init__()
+        self.setAutoDelete(True)
         self.signals = WorkerSignals()
+        self.render_pool = render_pool
+        self.job_id = job_id
         self.user_text = user_text
         self.model_text = model_text
         self.image_paths = image_paths
-        self.temp_files = temp_files
         self.main_pdf_path = main_pdf_path
         self.show_headings = show_headings
         self.user_heading = user_heading
@@ -52,34 +85,153 @@ class PdfWorker(QObject):
 
     def run(self):
         """
-        Executes the PDF generation and merging task.
+        Executes the PDF page rendering task.
 
-        Creates a temporary PDF page with the provided text and then merges it
-        into the main PDF document. Emits a 'finished' signal with a success
-        or error message.
+        Creates a temporary PDF page with the provided text and queues it for
+        the MergerThread. Emits a 'finished' signal with a success or error
+        message once the page has been rendered.
         """
+        fd, temp_page_path = tempfile.mkstemp(suffix=".pdf")
+        os.close(fd)
+        queued = False
         try:
-            temp_page_path = "_temp_page.pdf"
-            
-            success_create = create_pdf_page(
+            future = self.render_pool.submit(
+                create_pdf_page,
                 self.user_text, self.model_text, self.image_paths, temp_page_path,
                 self.show_headings, self.user_heading, self.model_heading
             )
+            success_create = future.result()
             if not success_create:
                 raise RuntimeError("Failed to create the temporary PDF page.")
 
-            success_merge = merge_pdfs(self.main_pdf_path, temp_page_path)
-            if not success_merge:
-                raise RuntimeError("Failed to merge the new page into the main PDF.")
-                
-            self.signals.finished.emit("Success! Page added.")
+            _merge_queue.put((self.job_id, self.main_pdf_path, temp_page_path))
+            queued = True
+            self.signals.finished.emit(self.job_id, "Page rendered.")
+        except BrokenProcessPool:
+            # Every later submit() to a broken pool fails too; have the GUI
+            # thread replace it before the next page.
+            self.signals.render_process_died.emit()
+            self.signals.finished.emit(
+                self.job_id, "Error: The render process stopped unexpectedly. It has been restarted; please try again."
+            )
         except Exception as e:
-            self.signals.finished.emit(f"Error: {e}")
+            self.signals.finished.emit(self.job_id, f"Error: {e}")
         finally:
-            for temp_file in self.temp_files:
-                os.remove(temp_file)
+            # Once queued, the merger owns the page and removes it after merging.
+            if not queued:
+                os.unlink(temp_page_path)
+
+class MergerThread(QThread):
+    """
+    Appends rendered pages to the main PDF, one at a time.
+
+    This long-lived thread consumes pages from the merge queue in the order
+    they were rendered and adds them to a PdfSession, which keeps the main PDF
+    open in memory. The session is only written to disk when a save is
+    requested (or the thread is stopped), and it is swapped for a new one when
+    pages start targeting a different file.
+
+    Supported signals are:
+    - merged: Emits the job id of the page (None for saves) and a string to
+      indicate a page was added, the PDF was saved, or an error.
+    """
+    merged = Signal(object, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.session = None
+        # Result of the save made when the thread was last stopped.
+        self._saved_on_stop = True
+
+    def run(self):
+        """Consumes the merge queue until a None sentinel is received."""
+        while True:
+            job = _merge_queue.get()
+            if job is None:
+                self._saved_on_stop = self._save()
+                break
+            if job is _SAVE_REQUEST:
+                if self.session is None or not self.session.dirty:
+                    self.merged.emit(None, "Success! No unsaved pages.")
+                elif self._save():
+                    self.merged.emit(None, "Success! PDF saved.")
+                else:
+                    self.merged.emit(None, f"Error: Failed to save {self.session.main_pdf_path}.")
+                continue
+            job_id, main_pdf_path, page_path = job
+            try:
+                if self.session is None or self.session.main_pdf_path != main_pdf_path:
+                    # The old session is kept until it is safely on disk;
+                    # dropping it after a failed save would lose its pages.
+                    if not self._save():
+                        raise RuntimeError(
+                            f"Failed to save {self.session.main_pdf_path}, so the new page was not added."
+                        )
+                    self.session = None
+                    self.session = PdfSession(main_pdf_path)
+                if not self.session.append_page(page_path):
+                    raise RuntimeError("Failed to merge the new page into the main PDF.")
+                self.merged.emit(job_id, "Success! Page added. Click Save to write the PDF.")
+            except Exception as e:
+                # append_page() removes the page itself; any other failure leaves it behind.
+                with contextlib.suppress(OSError):
+                    os.remove(page_path)
+                self.merged.emit(job_id, f"Error: {e}")
+
+    def _save(self):
+        """
+        Writes the current session to disk if it has unsaved pages.
+
+        Returns:
+            bool: False if the write failed, True otherwise (including when
+            there was nothing to write).
+        """
+        if self.session is None or not self.session.dirty:
+            return True
+        return self.session.write()
+
+    def request_save(self):
+        """Asks the merger to write its session once queued pages are added."""
+        _merge_queue.put(_SAVE_REQUEST)
+
+    def stop(self):
+        """
+        Lets queued pages finish merging, saves, then stops the thread.
+
+        The session survives a failed save, so the thread can be started
+        again to retry later.
+
+        Returns:
+            bool: False if the unsaved pages could not be written, True otherwise.
+        """
+        _merge_queue.put(None)
+        self.wait()
+        return self._saved_on_stop
 
 # --- Image Drop Widget ---
+# Pasted images are scaled down to the printable A4 width (210mm minus the two
+# 1cm page margins) at 150 DPI; anything wider is downscaled by the browser anyway.
+MAX_IMAGE_WIDTH = 1122
+JPEG_QUALITY = 85
+# Qt maps PNG "quality" to zlib level as (100 - quality) * 9 / 91, so 80 selects
+# level 1. The temp file only lives until the page is rendered, and level 1
+# encodes large screenshots about twice as fast as Qt's default.
+PNG_QUALITY = 80
+
+def _is_opaque(image):
+    """Returns True if no pixel of the QImage is even partly transparent."""
+    if not image.hasAlphaChannel():
+        return True
+    alpha = image.convertToFormat(QImage.Format_Alpha8)
+    bits = alpha.constBits()
+    width = alpha.width()
+    opaque_row = b"\xff" * width
+    # Compare row by row: scanlines are padded to 4 bytes.
+    return all(
+        bits[offset:offset + width] == opaque_row
+        for offset in range(0, alpha.sizeInBytes(), alpha.bytesPerLine())
+    )
+
 class ImageDropWidget(QListWidget):
     """
     A QListWidget that accepts drag-and-drop and clipboard pastes of images.
@@ -88,7 +240,18 @@ class ImageDropWidget(QListWidget):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.setIconSize(self.sizeHint() / 4)
+        # Pasted images are written into one directory for the whole session,
+        # which is removed in a single sweep when the application exits.
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="convarch_")
+        atexit.register(self._tmpdir.cleanup)
         self.temp_files = []
+        # The temp files of the page being rendered; see hand_off_temp_files.
+        self._handed_off = ()
+        # Maps a digest of the encoded image to the temp file already holding it.
+        self._hash_to_path = {}
+        # Image paths in list order, kept alongside the items so they can be
+        # read without going through every QListWidgetItem.
+        self._paths = []
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls() or event.mimeData().hasImage():
@@ -99,29 +262,20 @@ class ImageDropWidget(QListWidget):
 
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
-            for url in event.mimeData().urls():
-                self.add_image(url.toLocalFile())
+            self.add_images(url.toLocalFile() for url in event.mimeData().urls())
         elif event.mimeData().hasImage():
             image = event.mimeData().imageData()
             if image:
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp:
-                    image.save(temp.name, "PNG")
-                    self.add_image(temp.name)
-                    self.temp_files.append(temp.name)
+                self.save_image(image)
 
     def keyPressEvent(self, event):
         if event.matches(QKeySequence.StandardKey.Paste):
             clipboard = QApplication.clipboard()
             mime_data = clipboard.mimeData()
             if mime_data.hasImage():
-                image = clipboard.image()
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp:
-                    image.save(temp.name, "PNG")
-                    self.add_image(temp.name)
-                    self.temp_files.append(temp.name)
+                self.save_image(clipboard.image())
             elif mime_data.hasUrls():
-                for url in mime_data.urls():
-                    self.add_image(url.toLocalFile())
+                self.add_images(url.toLocalFile() for url in mime_data.urls())
         else:
             super().keyPressEvent(event)
 
@@ -132,15 +286,131 @@ class ImageDropWidget(QListWidget):
             remove_action = menu.addAction("Remove Image")
             action = menu.exec(self.mapToGlobal(event.pos()))
             if action == remove_action:
-                self.takeItem(self.row(item))
+                row = self.row(item)
+                self.takeItem(row)
+                del self._paths[row]
+
+    def clear(self):
+        """Removes all images from the list."""
+        super().clear()
+        self._paths.clear()
+
+    def image_paths(self):
+        """Returns a copy of the image paths, in list order."""
+        return list(self._paths)
+
+    def save_image(self, image):
+        """
+        Saves a pasted or dropped image to a temporary file and adds it.
+
+        Images wider than MAX_IMAGE_WIDTH are scaled down first. Opaque images
+        are stored as JPEG, which is several times smaller than PNG for photos
+        and screenshots; PNG is only kept when there is transparency to preserve.
+        Pasting the same image again reuses the temp file written the first
+        time, unless that file belongs to the page being rendered, which
+        deletes it once the page is added.
+
+        Args:
+            image (QImage): The image taken from the clipboard or drop event.
+        """
+        if image.width() > MAX_IMAGE_WIDTH:
+            image = image.scaledToWidth(MAX_IMAGE_WIDTH, Qt.SmoothTransformation)
+        if _is_opaque(image):
+            suffix, image_format, quality = ".jpg", b"JPG", JPEG_QUALITY
+        else:
+            suffix, image_format, quality = ".png", b"PNG", PNG_QUALITY
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        writer = QImageWriter(buffer, image_format)
+        writer.setQuality(quality)
+        writer.write(image)
+        data = buffer.data().data()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+        cached_path = self._hash_to_path.get(digest)
+        if cached_path is not None and cached_path not in self._handed_off and os.path.exists(cached_path):
+            self.add_image(cached_path)
+            return
+        with tempfile.NamedTemporaryFile(suffix=suffix, dir=self._tmpdir.name, delete=False) as temp:
+            temp.write(data)
+        self._hash_to_path[digest] = temp.name
+        self.add_image(temp.name)
+        self.temp_files.append(temp.name)
+
+    def hand_off_temp_files(self):
+        """
+        Marks the current temp files as belonging to the page being rendered.
+
+        Returns:
+            tuple: The snapshot of temp files handed off with the page.
+        """
+        self._handed_off = tuple(self.temp_files)
+        return self._handed_off
+
+    def release_temp_files(self, page_added):
+        """
+        Ends the hand-off started by hand_off_temp_files.
+
+        Once the page has been added its images are no longer needed, so the
+        snapshot's files are deleted and forgotten. Images pasted after the
+        snapshot was taken stay tracked. If the page failed, the files are
+        kept, so the images still in the list can be used for a retry.
+
+        Args:
+            page_added (bool): True if the page made it into the PDF.
+        """
+        handed_off, self._handed_off = set(self._handed_off), ()
+        if not page_added:
+            return
+        for temp_file in handed_off:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_file)
+        self.temp_files = [path for path in self.temp_files if path not in handed_off]
+        self._hash_to_path = {
+            digest: path for digest, path in self._hash_to_path.items() if path not in handed_off
+        }
+
+    def _thumbnail(self, image_path):
+        """
+        Builds a list icon without keeping a full-resolution copy of the image.
+
+        QImageReader decodes straight to icon size where the format supports it
+        (e.g. JPEG) and downscales right after decoding otherwise, so only the
+        small thumbnail ends up in the icon.
+        """
+        reader = QImageReader(image_path)
+        size = reader.size()
+        if size.isValid():
+            size.scale(self.iconSize(), Qt.KeepAspectRatio)
+            reader.setScaledSize(size)
+        return QIcon(QPixmap.fromImage(reader.read()))
+
+    def add_images(self, image_paths):
+        """
+        Adds several images at once, repainting the list only once at the end.
+
+        Args:
+            image_paths (iterable): The paths of the images to add.
+        """
+        sorting = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        self.setUpdatesEnabled(False)
+        try:
+            for image_path in image_paths:
+                self.add_image(image_path)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.setSortingEnabled(sorting)
+            self.update()
 
     def add_image(self, image_path):
         if os.path.exists(image_path):
             item = QListWidgetItem()
-            item.setIcon(QIcon(image_path))
+            item.setIcon(self._thumbnail(image_path))
             item.setText(os.path.basename(image_path))
             item.setData(Qt.UserRole, image_path)
             self.addItem(item)
+            self._paths.append(image_path)
 
 # --- Main Application Window ---
 class MainWindow(QMainWindow):
@@ -184,6 +454,16 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.image_drop_widget)
 
         # --- File Chooser ---
+        # The chosen PDF; None until the user picks one. The label only displays it.
+        self._selected_pdf = None
+        # Checked once when the file is chosen, so a read-only PDF disables
+        # 'Add to PDF' up front instead of failing after a page was rendered.
+        self._pdf_writable = True
+        self._rendering = False
+        # The page currently being rendered or merged; its inputs are only
+        # cleared once the merger has added it.
+        self._job_ids = itertools.count()
+        self._current_job = None
         file_layout = QHBoxLayout()
         self.pdf_path_label = QLineEdit("No file selected...")
         self.pdf_path_label.setReadOnly(True)
@@ -198,15 +478,53 @@ class MainWindow(QMainWindow):
         self.add_button = QPushButton("Add to PDF")
         self.add_button.clicked.connect(self.process_and_add_pdf)
         bottom_layout.addWidget(self.add_button)
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.save_pdf)
+        bottom_layout.addWidget(save_button)
         self.status_label = QLabel("Status: Ready")
         bottom_layout.addWidget(self.status_label)
         main_layout.addLayout(bottom_layout)
 
+        # --- Render Process ---
+        self._start_render_pool()
+
+        # --- Merger Thread ---
+        # 'merged' is emitted from the merger thread, so its slot is queued too.
+        self.merger = MergerThread(self)
+        self.merger.merged.connect(self.on_merge_finished, Qt.QueuedConnection)
+        self.merger.start()
+
+    def _start_render_pool(self):
+        """
+        Starts the render process.
+
+        Pages are submitted one at a time, so a single long-lived process is
+        enough and keeps its imports and caches warm between pages.
+        """
+        # Always spawned, never forked: a fork of this process would copy a
+        # running Qt application along with the merger and pool threads.
+        self.render_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        # Starts the process and does its one-time setup while the user types.
+        self.render_pool.submit(warm_up)
+
+    def _restart_render_pool(self):
+        """Replaces a render process that crashed."""
+        self.render_pool.shutdown(wait=False)
+        self._start_render_pool()
+
     def choose_file(self):
         """Opens a file dialog to select the main PDF file."""
         filepath, _ = QFileDialog.getOpenFileName(self, "Select Your Main PDF File", "", "PDF Files (*.pdf)")
         if filepath:
+            self._selected_pdf = Path(filepath)
             self.pdf_path_label.setText(filepath)
+            self._pdf_writable = os.access(filepath, os.W_OK)
+            self.add_button.setToolTip("" if self._pdf_writable else "The selected PDF is read-only.")
+            self._update_add_button()
+
+    def _update_add_button(self):
+        """Enables 'Add to PDF' unless a page is rendering or the PDF is read-only."""
+        self.add_button.setEnabled(self._pdf_writable and not self._rendering)
 
     def process_and_add_pdf(self):
         """
@@ -218,54 +536,132 @@ class MainWindow(QMainWindow):
         """
         user_text = self.user_text_box.toPlainText().strip()
         model_text = self.model_text_box.toPlainText().strip()
-        main_pdf_path = self.pdf_path_label.text()
 
         if not user_text and not model_text:
             QMessageBox.warning(self, "Warning", "Both text boxes are empty.")
             return
-        if "No file selected..." in main_pdf_path:
+        if self._selected_pdf is None:
             QMessageBox.warning(self, "Warning", "Please choose a destination PDF file.")
             return
+        main_pdf_path = str(self._selected_pdf)
 
-        self.add_button.setEnabled(False)
+        self._rendering = True
+        self._update_add_button()
         self.status_label.setText("Status: Processing...")
 
         # --- Setup and run worker thread ---
-        image_paths = []
-        for i in range(self.image_drop_widget.count()):
-            item = self.image_drop_widget.item(i)
-            image_paths.append(item.data(Qt.UserRole))
+        # The worker only gets immutable snapshots, never the widget's own lists,
+        # so the GUI thread can keep editing them while the page renders.
+        image_paths = tuple(self.image_drop_widget.image_paths())
+        self.image_drop_widget.hand_off_temp_files()
 
+        self._current_job = next(self._job_ids)
         self.worker = PdfWorker(
-            user_text, model_text, image_paths, self.image_drop_widget.temp_files, main_pdf_path,
+            self._current_job, user_text, model_text, image_paths, main_pdf_path,
             self.show_headings_check.isChecked(),
             self.user_heading_entry.text().strip(),
-            self.model_heading_entry.text().strip()
+            self.model_heading_entry.text().strip(),
+            self.render_pool
         )
-        self.thread = threading.Thread(target=self.worker.run)
-        self.worker.signals.finished.connect(self.on_processing_finished)
-        self.thread.start()
-
-    def on_processing_finished(self, message):
+        # Emitted from a pool thread; queue the slot explicitly so it always
+        # runs on the GUI thread's event loop.
+        self.worker.signals.finished.connect(self.on_processing_finished, Qt.QueuedConnection)
+        self.worker.signals.render_process_died.connect(self._restart_render_pool, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(self.worker)
+
+    def save_pdf(self):
+        """Writes the pages added so far to the main PDF file."""
+        self.status_label.setText("Status: Saving...")
+        self.merger.request_save()
+
+    def on_processing_finished(self, job_id, message):
         """
         Handles the 'finished' signal from the PDF worker thread.
 
-        Updates the status label with the result message, clears the text
-        boxes on success, and re-enables the 'Add to PDF' button.
+        On error, shows the message and ends the job with the inputs kept. On
+        success the page still has to be merged; on_merge_finished ends the
+        job then. Both signals are queued from different threads, so the merge
+        result can arrive first, in which case there is nothing left to do.
 
         Args:
+            job_id (int): The job the worker rendered.
             message (str): The status message from the worker.
         """
+        if job_id != self._current_job:
+            return
         if message.startswith("Error"):
             QMessageBox.critical(self, "Error", message)
             self.status_label.setText("Status: Error!")
+            self._finish_job(page_added=False)
         else:
+            self.status_label.setText("Status: Merging...")
+
+    def on_merge_finished(self, job_id, message):
+        """
+        Handles the 'merged' signal from the merger thread.
+
+        Clears the text boxes and images once their page has been added; if
+        the merge failed they are kept so the user can try again.
+
+        Args:
+            job_id (int): The job whose page was merged, or None for a save.
+            message (str): The status message from the merger.
+        """
+        page_added = not message.startswith("Error")
+        if page_added:
             self.status_label.setText(f"Status: {message}")
+        else:
+            QMessageBox.critical(self, "Error", message)
+            self.status_label.setText("Status: Error!")
+        if job_id is None or job_id != self._current_job:
+            return
+        if page_added:
             self.user_text_box.clear()
             self.model_text_box.clear()
             self.image_drop_widget.clear()
-            self.image_drop_widget.temp_files.clear()
-        self.add_button.setEnabled(True)
+        self._finish_job(page_added)
+
+    def _finish_job(self, page_added):
+        """
+        Ends the current job and re-enables the 'Add to PDF' button.
+
+        Args:
+            page_added (bool): True if the page made it into the PDF; its
+                temp images are only deleted then.
+        """
+        self.image_drop_widget.release_temp_files(page_added)
+        self._current_job = None
+        self._rendering = False
+        self._update_add_button()
+
+    def closeEvent(self, event):
+        """
+        Merges and saves any queued pages before the window closes.
+
+        If they cannot be saved (e.g. the PDF is open in a viewer that locks
+        it), the user can retry the save, discard the unsaved pages and quit,
+        or cancel and keep the window open so the pages are not lost.
+        """
+        QThreadPool.globalInstance().waitForDone()
+        while not self.merger.stop():
+            answer = QMessageBox.question(
+                self, "Error",
+                f"Error: Failed to save {self.merger.session.main_pdf_path}. "
+                "Close it in other programs and try again, or discard the unsaved pages.",
+                QMessageBox.Retry | QMessageBox.Discard | QMessageBox.Cancel,
+                QMessageBox.Retry
+            )
+            if answer == QMessageBox.Discard:
+                break
+            # The stopped merger still holds the session; restart it so the
+            # save can be retried (now or on the next close).
+            self.merger.start()
+            if answer != QMessageBox.Retry:
+                self.status_label.setText("Status: Error!")
+                event.ignore()
+                return
+        self.render_pool.shutdown()
+        super().closeEvent(event)
 
 def main():
     """Initializes and runs the Qt application."""
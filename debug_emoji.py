@@ -1,7 +1,33 @@
 import os
+import functools
+import string
 from xhtml2pdf import pisa
 import io
 
+# --- HTML template ---
+# Only the emoji text changes between runs, so the page skeleton is built once
+# and filled in with string.Template.
+HTML_TEMPLATE = string.Template("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <style>$css_content</style>
+        </head>
+        <body>
+            <p>$emoji_text</p>
+        </body>
+        </html>
+        """)
+
+@functools.lru_cache(maxsize=1)
+def _load_css():
+    """Reads style.css once; later calls reuse the cached contents."""
+    # We are using the exact same CSS file as our main app.
+    css_path = os.path.join(os.path.dirname(__file__), 'style.css')
+    with open(css_path, "r", encoding="utf-8") as f:
+        return f.read()
+
 def create_debug_pdf(output_path):
     """
     A focused test to see if xhtml2pdf can render a color emoji
@@ -9,32 +35,20 @@ def create_debug_pdf(output_path):
     """
     try:
         # --- 1. Load the CSS content ---
-        # We are using the exact same CSS file as our main app.
-        css_path = os.path.join(os.path.dirname(__file__), 'style.css')
-        with open(css_path, "r", encoding="utf-8") as f:
-            css_content = f.read()
+        css_content = _load_css()
 
         # --- 2. Define the simplest possible HTML ---
         # This HTML contains only one thing: a paragraph with a test emoji.
         # This removes all other variables from the test.
         emoji_text = "This is a test: 😊"
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>{css_content}</style>
-        </head>
-        <body>
-            <p>{emoji_text}</p>
-        </body>
-        </html>
-        """
+        html_content = HTML_TEMPLATE.substitute(css_content=css_content, emoji_text=emoji_text)
 
         # --- 3. Render the PDF ---
         with open(output_path, "w+b") as result_file:
+            # Hand pisa UTF-8 bytes directly; with a text buffer it has to
+            # re-encode the whole document (and rejects the encoding argument).
             pisa_status = pisa.CreatePDF(
-                io.StringIO(html_content),
+                io.BytesIO(html_content.encode('utf-8')),
                 dest=result_file,
                 encoding='utf-8'
             )
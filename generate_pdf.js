@@ -1,48 +1,368 @@
 const puppeteer = require('puppeteer');
-const path = require('path');
 const fs = require('fs');
+const path = require('path');
+const { pathToFileURL, fileURLToPath } = require('url');
+
+// Chromium subsystems a PDF renderer never needs. Leaving them off makes
+// launch() faster and the browser smaller. The sandbox stays enabled: the
+// pages render pasted Markdown, which may contain raw HTML.
+const MINIMAL_ARGS = [
+    '--disable-gpu',
+    '--use-gl=swiftshader',
+    '--disable-dev-shm-usage',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-breakpad',
+    '--disable-client-side-phishing-detection',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-domain-reliability',
+    '--disable-extensions',
+    '--disable-hang-monitor',
+    '--disable-ipc-flooding-protection',
+    '--disable-sync',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-default-browser-check',
+    '--no-first-run',
+    '--no-pings',
+    // Pages reference style.css and the user's images by file:// URL (see openTab).
+    '--allow-file-access-from-files',
+];
+
+// Resource types a PDF page never needs. Aborting them keeps Chromium from
+// opening connections that 'networkidle0' would otherwise wait on. Scripts
+// in pasted content must not be able to read data and send it anywhere, so
+// fetch() and XMLHttpRequest are blocked as well.
+const BLOCKED_RESOURCE_TYPES = new Set([
+    'media', 'websocket', 'eventsource', 'manifest', 'texttrack', 'ping',
+    'fetch', 'xhr',
+]);
+
+// Tabs kept open for concurrent jobs; matches PAGE_WORKERS in pdf_engine.py.
+const TAB_COUNT = 4;
+
+// Every job starts from a fresh document at this URL (see renderPdf).
+const BASE_URL = pathToFileURL(__dirname + path.sep).href;
 
 /**
- * Generates a PDF from a temporary HTML file using Puppeteer.
+ * Normalises a local path so that two spellings of the same file compare equal.
  *
- * This script is called by the Python backend. It launches a headless Chrome
- * instance, reads the content from `_temp.html`, renders it, and saves it
- * as `_temp_page.pdf`. The Python script is responsible for creating the
- * HTML file beforehand and handling the generated PDF afterward.
+ * @param {string} filePath An absolute path.
+ * @returns {string} The resolved path, lower-cased on Windows, whose file
+ *                   system ignores case.
+ */
+function normalizePath(filePath) {
+    const resolved = path.resolve(filePath);
+    return process.platform === 'win32' ? resolved.toLowerCase() : resolved;
+}
+
+// The directory BASE_URL points at; tabs must be allowed to load it.
+const BASE_DIR = normalizePath(__dirname);
+
+// pdf_engine.py links style.css by its fully resolved path, so resolve any
+// symlinks in this script's directory as well.
+const STYLE_PATH = normalizePath(path.join(fs.realpathSync(__dirname), 'style.css'));
+
+// The local image files each tab's current job may load, by tab.
+const ALLOWED_FILES = new WeakMap();
+
+// Persistent profile, so the HTTP cache (Google Fonts, MathJax) survives restarts.
+const USER_DATA_DIR = path.join(__dirname, 'puppeteer_user_data');
+
+/**
+ * Launches the lightweight headless shell with the minimal argument set.
+ *
+ * Chromium locks its profile directory, so if another instance of the app
+ * already holds the persistent profile, this falls back to a throwaway one.
+ *
+ * @returns {Promise<import('puppeteer').Browser>} The launched browser.
+ */
+async function launchBrowser() {
+    const options = {
+        headless: 'shell',
+        args: MINIMAL_ARGS,
+    };
+    try {
+        return await puppeteer.launch({ ...options, userDataDir: USER_DATA_DIR });
+    } catch (err) {
+        console.error('Could not use the persistent profile, using a temporary one:', err.message);
+        return await puppeteer.launch(options);
+    }
+}
+
+/**
+ * Tells whether a tab may load a URL, as far as local files are concerned.
  *
- * @returns {Promise<void>} A promise that resolves when the PDF is generated.
- *                          The process will exit with a non-zero error code on failure.
+ * @param {import('puppeteer').Page} page The tab making the request.
+ * @param {string} url The requested URL.
+ * @returns {boolean} False for a file:// URL the tab's current job did not
+ *                    list; true for any other URL.
  */
-async function generatePdf() {
+function isAllowedFile(page, url) {
+    if (!url.startsWith('file:')) {
+        return true;
+    }
+    // Chromium canonicalises the URLs it requests, so paths are compared in
+    // normalised form rather than as URL strings.
+    let filePath;
     try {
-        const browser = await puppeteer.launch({
-            headless: "new",
-        });
-        const page = await browser.newPage();
-
-        // The Python script will create this temporary HTML file
-        const htmlFilePath = path.resolve(__dirname, '_temp.html');
-        const htmlContent = fs.readFileSync(htmlFilePath, 'utf8');
-
-        // Set the page content and wait for all fonts to load from Google Fonts
-        await page.setContent(htmlContent, {
-            waitUntil: 'networkidle0'
-        });
-
-        // Generate the PDF
-        await page.pdf({
-            path: '_temp_page.pdf', // The Python script will look for this file
-            format: 'A4',
-            printBackground: true,
-        });
-
-        await browser.close();
-        console.log('PDF page generated successfully by Puppeteer.');
+        filePath = normalizePath(fileURLToPath(url));
+    } catch (err) {
+        return false;
+    }
+    if (filePath === BASE_DIR || filePath === STYLE_PATH) {
+        return true;
+    }
+    const allowed = ALLOWED_FILES.get(page);
+    return allowed !== undefined && allowed.has(filePath);
+}
+
+/**
+ * Opens a tab that blocks the resource types in BLOCKED_RESOURCE_TYPES.
+ *
+ * Pages run under a file:// URL with file access allowed, and their HTML comes
+ * from pasted Markdown, which may contain raw scripts. So the only file://
+ * requests let through are BASE_URL itself, style.css and the images listed
+ * in the current job; anything else on disk stays out of reach.
+ *
+ * @param {import('puppeteer').Browser} browser The long-lived browser instance.
+ * @returns {Promise<import('puppeteer').Page>} The new tab.
+ */
+async function openTab(browser) {
+    const page = await browser.newPage();
+    await page.setRequestInterception(true);
+    page.on('request', (request) => {
+        if (BLOCKED_RESOURCE_TYPES.has(request.resourceType()) || !isAllowedFile(page, request.url())) {
+            request.abort();
+        } else {
+            request.continue();
+        }
+    });
+    return page;
+}
+
+/**
+ * Keeps up to `size` tabs open and hands them out to concurrent jobs.
+ *
+ * Tabs are opened on demand and reused for later jobs instead of being
+ * opened and closed per page. When every tab is busy, acquire() waits until
+ * one is released. A tab whose job failed is discarded rather than reused.
+ *
+ * @param {import('puppeteer').Browser} browser The long-lived browser instance.
+ * @param {number} size The maximum number of tabs.
+ * @returns {{acquire: function(): Promise<import('puppeteer').Page>,
+ *            release: function(import('puppeteer').Page): void,
+ *            discard: function(import('puppeteer').Page): void}} The pool.
+ */
+function createTabPool(browser, size) {
+    const idle = [];
+    const waiting = [];
+    let open = 0;
+
+    async function newTab() {
+        open++;
+        try {
+            return await openTab(browser);
+        } catch (err) {
+            open--;
+            throw err;
+        }
+    }
+
+    return {
+        acquire() {
+            if (idle.length > 0) {
+                return Promise.resolve(idle.pop());
+            }
+            if (open < size) {
+                return newTab();
+            }
+            return new Promise((resolve, reject) => waiting.push({ resolve, reject }));
+        },
+        release(page) {
+            const waiter = waiting.shift();
+            if (waiter) {
+                waiter.resolve(page);
+            } else {
+                idle.push(page);
+            }
+        },
+        discard(page) {
+            open--;
+            page.close().catch(() => {});
+            const waiter = waiting.shift();
+            if (waiter) {
+                newTab().then(waiter.resolve, waiter.reject);
+            }
+        },
+    };
+}
+
+/**
+ * Renders an HTML document to a PDF in the given tab.
+ *
+ * The tab is first navigated to BASE_URL. setContent() replaces the document
+ * but keeps its window, so without a navigation the globals, timers and
+ * scripts of the tab's previous job (e.g. an already-loaded MathJax) would
+ * leak into this one. It also gives the page a file:// URL: setContent()
+ * keeps the tab's URL, and Chromium only lets file:// documents load the
+ * file:// stylesheet and images that the Python backend links to.
+ *
+ * @param {import('puppeteer').Page} page A tab from the tab pool.
+ * @param {string} htmlContent The HTML document sent by the Python backend.
+ * @param {string} outputPath Where the PDF page should be saved.
+ * @param {string[]} files The file:// URLs of the images the page may load.
+ * @returns {Promise<void>} A promise that resolves when the PDF is written.
+ */
+async function renderPdf(page, htmlContent, outputPath, files) {
+    ALLOWED_FILES.set(page, new Set(files.map((url) => normalizePath(fileURLToPath(url)))));
+    await page.goto(BASE_URL);
+
+    // Set the page content and wait for all fonts to load from Google Fonts
+    await page.setContent(htmlContent, {
+        waitUntil: 'networkidle0'
+    });
+
+    // Generate the PDF
+    await page.pdf({
+        path: outputPath,
+        format: 'A4',
+        printBackground: true,
+    });
+}
+
+/**
+ * Splits stdin into jobs: a JSON header line followed by `length` bytes of HTML.
+ *
+ * Incoming chunks are collected in a list and only concatenated once a
+ * header line or a whole HTML body is available, so large documents are not
+ * copied over and over as they arrive.
+ *
+ * @param {NodeJS.ReadableStream} input The stream to read jobs from.
+ * @returns {AsyncGenerator<{job: {id: number, out: string, files: string[],
+ *                                 length: number},
+ *                           html: string}>} The jobs, in the order received.
+ */
+async function* readJobs(input) {
+    let chunks = [];
+    let size = 0;
+    let job = null;
+    for await (const chunk of input) {
+        chunks.push(chunk);
+        size += chunk.length;
+        for (;;) {
+            if (job === null) {
+                const data = chunks.length === 1 ? chunks[0] : Buffer.concat(chunks, size);
+                const newline = data.indexOf(0x0a);
+                chunks = [data];
+                if (newline === -1) {
+                    break;
+                }
+                const header = data.toString('utf8', 0, newline).trim();
+                if (header) {
+                    job = JSON.parse(header);
+                }
+                chunks = [data.subarray(newline + 1)];
+                size = chunks[0].length;
+            } else {
+                if (size < job.length) {
+                    break;
+                }
+                const data = chunks.length === 1 ? chunks[0] : Buffer.concat(chunks, size);
+                yield { job, html: data.toString('utf8', 0, job.length) };
+                chunks = [data.subarray(job.length)];
+                size = chunks[0].length;
+                job = null;
+            }
+        }
+    }
+}
 
+/**
+ * Runs one job from stdin on a pooled tab and writes its reply to stdout.
+ *
+ * @param {ReturnType<typeof createTabPool>} tabs The tab pool.
+ * @param {{id: number, out: string, files: string[]}} job The job header.
+ * @param {string} html The HTML document to render.
+ * @returns {Promise<void>} A promise that resolves once the reply is written.
+ */
+async function handleJob(tabs, job, html) {
+    let reply;
+    try {
+        const page = await tabs.acquire();
+        try {
+            await renderPdf(page, html, job.out, job.files || []);
+        } catch (err) {
+            tabs.discard(page);
+            throw err;
+        }
+        tabs.release(page);
+        reply = { id: job.id, ok: true };
     } catch (err) {
         console.error('Error generating PDF with Puppeteer:', err);
+        reply = { id: job.id, ok: false, error: String(err && err.message ? err.message : err) };
+    }
+    process.stdout.write(JSON.stringify(reply) + '\n');
+}
+
+/**
+ * Long-running PDF worker for the Python backend.
+ *
+ * `pdf_engine.py` starts this script once and keeps it running, so Node,
+ * Puppeteer and Chromium start up once per session instead of once per page.
+ * Each job on stdin is a JSON header line, `{"id": <n>, "out": <PDF file>,
+ * "files": [<image file:// URL>, ...], "length": <bytes>}`, followed by
+ * exactly `length` bytes of UTF-8 HTML. Each
+ * job is answered with exactly one JSON line on stdout: `{"id": <n>, "ok":
+ * true}` or `{"id": <n>, "ok": false, "error": <message>}`. Up to TAB_COUNT
+ * jobs are rendered at once, so replies may come back in a different order
+ * than the jobs. Diagnostics go to stderr so they can't be mistaken for
+ * replies.
+ *
+ * The browser is closed and the process exits when stdin is closed, which
+ * also happens automatically when the Python process exits. If the browser
+ * goes away on its own, the process exits with an error code.
+ *
+ * @returns {Promise<void>} A promise that resolves when stdin is closed.
+ *                          The process will exit with a non-zero error code
+ *                          if the browser cannot be launched.
+ */
+async function main() {
+    let browser;
+    try {
+        browser = await launchBrowser();
+    } catch (err) {
+        console.error('Error launching Puppeteer:', err);
         process.exit(1); // Exit with an error code
     }
+
+    // If Chromium crashes or is killed, every later job would fail against the
+    // dead browser. Exiting instead makes the Python side fail the jobs in
+    // flight and start a fresh worker for the next page.
+    let closing = false;
+    browser.on('disconnected', () => {
+        if (!closing) {
+            console.error('The browser disconnected unexpectedly.');
+            process.exit(1);
+        }
+    });
+
+    const tabs = createTabPool(browser, TAB_COUNT);
+    const running = new Set();
+    for await (const { job, html } of readJobs(process.stdin)) {
+        // Not awaited: jobs run concurrently, limited by the tab pool.
+        const rendering = handleJob(tabs, job, html);
+        running.add(rendering);
+        rendering.finally(() => running.delete(rendering));
+    }
+
+    await Promise.all(running);
+    closing = true;
+    await browser.close();
 }
 
-generatePdf();
\ No newline at end of file
+main();
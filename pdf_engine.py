@@ -1,14 +1,132 @@
 import os
+import json
+import functools
+import threading
+import itertools
+import contextlib
 import subprocess
-import base64
-import mimetypes
-from pypdf import PdfWriter, PdfReader
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
 import html
-import markdown
 import re
-from pygments import highlight
-from pygments.lexers import get_lexer_by_name, TextLexer
-from pygments.formatters import HtmlFormatter
+
+# MathJax is loaded from a CDN, so it is only included in pages that contain math.
+MATHJAX_SCRIPT = '<script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>'
+
+# Exercises every lazily-loaded part of markdown_to_html_final (see warm_up).
+WARM_UP_MARKDOWN = "```python\npass\n```\n\n| a |\n|---|\n| $x$ |\n"
+
+# Pages link to style.css instead of embedding it, so Chromium loads and
+# parses it once and reuses it for every page it renders.
+_STYLE_CSS_URI = Path(__file__).resolve().with_name('style.css').as_uri()
+
+def warm_up():
+    """
+    Performs the one-time setup that would otherwise slow down the first page.
+
+    Meant to be run once in the render process at application start-up, in
+    the background, so the user's first "Add to PDF" click doesn't pay for it.
+    """
+    # Markdown imports its extensions and Pygments its lexers on first use;
+    # converting a tiny document with code and math pulls them all in now.
+    markdown_to_html_final(WARM_UP_MARKDOWN)
+    # Launching Node, Puppeteer and Chromium is by far the slowest step.
+    _puppeteer()
+
+# Matches the start of a fence line: indentation and the three backticks.
+_FENCE_RE = re.compile(r"^[ \t]*```", re.MULTILINE)
+
+def _find_code_blocks(text):
+    """
+    Finds the fenced code blocks in a Markdown string in a single linear pass.
+
+    The fence lines are located first and then paired up in order, rather
+    than matching whole blocks with a lazy DOTALL regex, which rescans the
+    rest of the text from every fence that has no closing partner. A block
+    runs from an opening fence to the next fence line that is at least one
+    line below the opening line; anything after the closing backticks stays
+    in the text.
+
+    Args:
+        text (str): The Markdown text to scan.
+
+    Yields:
+        tuple: (start, end, language, content) for each block, where start
+        and end delimit the whole block in `text`, and language and content
+        are unstripped.
+    """
+    fences = [(m.start(), m.end()) for m in _FENCE_RE.finditer(text)]
+    i = 0
+    while i < len(fences):
+        open_start, open_end = fences[i]
+        newline = text.find('\n', open_end)
+        if newline == -1:
+            return
+        content_start = newline + 1
+        j = i + 1
+        while j < len(fences) and fences[j][0] <= content_start:
+            j += 1
+        if j == len(fences):
+            return
+        close_start, close_end = fences[j]
+        yield open_start, close_end, text[open_end:newline], text[content_start:close_start - 1]
+        i = j + 1
+
+# The markdown processor might wrap a placeholder in <p> tags; the wrapped form
+# is tried first so the tags go away together with the placeholder. The
+# trailing X ends the number, so digits typed right after a closing fence
+# (e.g. "```5") are not read as part of the block index.
+_PLACEHOLDER_RE = re.compile(r"<p>CODEBLOCK(\d+)X</p>|CODEBLOCK(\d+)X")
+
+# Pygments is only imported once a document actually contains a code block.
+@functools.lru_cache(maxsize=1)
+def _formatter():
+    """Returns the HtmlFormatter shared by every code block (it holds no per-call state)."""
+    from pygments.formatters import HtmlFormatter
+    return HtmlFormatter(cssclass="codehilite")
+
+@functools.lru_cache(maxsize=64)
+def _get_lexer(language):
+    """
+    Returns the Pygments lexer for a fence's language, falling back to plain text.
+
+    Pygments resolves names by scanning its lexer table and plugin entry points
+    on every lookup, so lexers are cached per language name.
+    """
+    from pygments.lexers import get_lexer_by_name, TextLexer
+    try:
+        return get_lexer_by_name(language)
+    except Exception:
+        return TextLexer()
+
+@functools.lru_cache(maxsize=512)
+def _highlight_cached(language, content):
+    """
+    Returns the highlighted HTML for one code block.
+
+    Edited transcripts often repeat the same snippet, so the output is cached
+    per (language, content) and identical blocks are only highlighted once.
+    """
+    from pygments import highlight
+    return highlight(content, _get_lexer(language), _formatter())
+
+# markdown.markdown() builds a new parser, with all of its extensions, on every
+# call. Each thread instead keeps one parser and resets it between documents
+# (a Markdown instance is not safe to share between threads).
+_markdown_parsers = threading.local()
+
+def _markdown_to_html(text):
+    """Runs Python-Markdown with the extensions used for every page."""
+    md = getattr(_markdown_parsers, 'md', None)
+    if md is None:
+        import markdown  # Only the render process needs Markdown (see merge_pdfs)
+        md = _markdown_parsers.md = markdown.Markdown(
+            extensions=['tables', 'nl2br', 'pymdownx.arithmatex'],
+            extension_configs={
+                'pymdownx.arithmatex': {'generic': True}
+            }
+        )
+    return md.reset().convert(text)
 
 def markdown_to_html_final(markdown_text):
     """
@@ -24,48 +142,182 @@ def markdown_to_html_final(markdown_text):
     Returns:
         str: The fully-formatted HTML.
     """
+    # Most responses contain no code at all; skip the scan and Pygments entirely.
+    if '```' not in markdown_text:
+        return _markdown_to_html(markdown_text)
+
     highlighted_blocks = []
+    parts = []
+    last_end = 0
+
+    # 1. Find all code blocks, highlight them, and replace each with a simple
+    #    placeholder that won't be altered by markdown processing.
+    for start, end, language, content in _find_code_blocks(markdown_text):
+        language = language.strip()
+        content = content.strip()
+
+        parts.append(markdown_text[last_end:start])
+        parts.append(f"CODEBLOCK{len(highlighted_blocks)}X")
+        highlighted_blocks.append(_highlight_cached(language, content))
+        last_end = end
+    parts.append(markdown_text[last_end:])
+    text_with_placeholders = ''.join(parts)
+
+    # 2. Process the main text (which now contains only placeholders).
+    html_output = _markdown_to_html(text_with_placeholders)
+
+    # 3. Replace the placeholders with the fully rendered HTML for the code blocks,
+    #    all in a single pass over the HTML.
+    def _restore_block(match):
+        index = int(match.group(1) or match.group(2))
+        if index < len(highlighted_blocks):
+            return highlighted_blocks[index]
+        return match.group(0)  # Literal "CODEBLOCK<n>X" typed by the user
+
+    return _PLACEHOLDER_RE.sub(_restore_block, html_output)
+
+# --- Puppeteer worker ---
+# A single long-lived `node generate_pdf.js` process (and so a single Chromium)
+# renders every page for this Python process. Each job goes out on its stdin as
+# a JSON header line, tagged with an id and giving the byte length of the HTML,
+# followed by exactly that many bytes of UTF-8 HTML. The header also lists the
+# local image files the page may load; the worker refuses every other file. Each job is answered by one
+# JSON line on its stdout carrying the same id. The worker renders several jobs
+# at once in separate tabs, so replies can arrive out of order. It exits on its
+# own once our end of the pipe is closed.
+class _PuppeteerWorker:
+    """
+    A running Puppeteer worker process and the jobs waiting on it.
+
+    Any number of threads may submit jobs; a background thread reads the
+    replies and completes the matching futures.
+    """
+    def __init__(self):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.proc = subprocess.Popen(
+            ['node', os.path.join(script_dir, 'generate_pdf.js')],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=script_dir
+        )
+        self.closed = False
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._job_ids = itertools.count()
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+    def submit(self, html_parts, output_path, image_paths=()):
+        """
+        Sends a render job to the worker.
+
+        The HTML is written to the pipe piece by piece after the job header,
+        so the complete document never exists as one string on this side.
+
+        Args:
+            html_parts (list): The HTML document to render, as strings in order.
+            output_path (str): The path where the PDF will be saved.
+            image_paths (iterable, optional): The local images the page links
+                to. The page is not allowed to load any other local file.
+
+        Returns:
+            Future: Resolves to None once the PDF is written, or raises
+            RuntimeError if the worker reports an error or exits.
+        """
+        chunks = [part.encode('utf-8') for part in html_parts]
+        future = Future()
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("The Puppeteer worker exited unexpectedly.")
+            job_id = next(self._job_ids)
+            job = {
+                "id": job_id,
+                "out": os.path.abspath(output_path),
+                "files": [_file_uri(image_path) for image_path in image_paths],
+                "length": sum(map(len, chunks)),
+            }
+            self._pending[job_id] = future
+            try:
+                # Holding the lock keeps a job's header and HTML together.
+                self.proc.stdin.write(json.dumps(job).encode('utf-8') + b"\n")
+                for chunk in chunks:
+                    self.proc.stdin.write(chunk)
+                self.proc.stdin.flush()
+            except OSError:
+                del self._pending[job_id]
+                self.closed = True
+                raise
+        return future
+
+    def _read_replies(self):
+        """
+        Completes pending jobs as replies arrive; fails the rest at exit.
 
-    def _highlight_and_replace(match):
-        language = match.group(1).strip()
-        content = match.group(2).strip()
-        placeholder = f"CODEBLOCK{len(highlighted_blocks)}"
+        Whatever ends this thread, including a malformed or unexpected reply,
+        the worker is marked closed and every waiting job fails, so no caller
+        is left waiting on a future that can never complete. The next job
+        then starts a fresh worker.
+        """
+        try:
+            for line in self.proc.stdout:
+                reply = json.loads(line)
+                with self._lock:
+                    future = self._pending.pop(reply["id"])
+                if reply["ok"]:
+                    future.set_result(None)
+                else:
+                    future.set_exception(RuntimeError(reply["error"]))
+        finally:
+            with self._lock:
+                self.closed = True
+                pending, self._pending = self._pending, {}
+                # Stops a worker that is still running but can no longer be
+                # understood; closing its stdin makes it exit.
+                with contextlib.suppress(OSError):
+                    self.proc.stdin.close()
+            for future in pending.values():
+                future.set_exception(RuntimeError("The Puppeteer worker exited unexpectedly."))
 
+    def reap(self):
+        """
+        Waits for a closed worker's process to exit.
+
+        Its stdin is already closed, so it normally exits on its own and only
+        has to be reaped; if it is stuck, it is killed after a few seconds.
+        """
         try:
-            lexer = get_lexer_by_name(language)
-        except Exception:
-            lexer = TextLexer()
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
 
-        formatter = HtmlFormatter(cssclass="codehilite")
-        highlighted_code = highlight(content, lexer, formatter)
-        highlighted_blocks.append(highlighted_code)
+_PUPPETEER = None
+# Pages create_pdf_pages() renders at once; matches TAB_COUNT in generate_pdf.js.
+PAGE_WORKERS = 4
+_PUPPETEER_LOCK = threading.Lock()
 
-        # Return a simple placeholder that won't be altered by markdown processing
-        return placeholder
+def _puppeteer():
+    """Returns the running Puppeteer worker, (re)starting it if necessary."""
+    global _PUPPETEER
+    with _PUPPETEER_LOCK:
+        if _PUPPETEER is None or _PUPPETEER.closed:
+            if _PUPPETEER is not None:
+                _PUPPETEER.reap()
+            _PUPPETEER = _PuppeteerWorker()
+        return _PUPPETEER
 
-    # 1. Find all code blocks, highlight them, and replace with a simple placeholder.
-    pattern = re.compile(r"^[ \t]*```([^\n]*)\n(.*?)\n^[ \t]*```", re.DOTALL | re.MULTILINE)
-    text_with_placeholders = pattern.sub(_highlight_and_replace, markdown_text)
+def _render_pdf(html_parts, output_path, image_paths=()):
+    """
+    Has the Puppeteer worker print a complete HTML document to a PDF file.
 
-    # 2. Process the main text (which now contains only placeholders).
-    html_output = markdown.markdown(
-        text_with_placeholders,
-        extensions=['tables', 'nl2br', 'pymdownx.arithmatex'],
-        extension_configs={
-            'pymdownx.arithmatex': {'generic': True}
-        }
-    )
-
-    # 3. Replace the placeholders with the fully rendered HTML for the code blocks.
-    for i, block_html in enumerate(highlighted_blocks):
-        # The markdown processor might wrap the placeholder in <p> tags.
-        placeholder_p = f"<p>CODEBLOCK{i}</p>"
-        if placeholder_p in html_output:
-            html_output = html_output.replace(placeholder_p, block_html)
-        else: # Fallback
-            html_output = html_output.replace(f"CODEBLOCK{i}", block_html)
-
-    return html_output
+    Args:
+        html_parts (list): The HTML document to render, as strings in order.
+        output_path (str): The path where the PDF will be saved.
+        image_paths (iterable, optional): The local images the page links to.
+
+    Raises:
+        RuntimeError: If the worker reports an error or exits unexpectedly.
+    """
+    _puppeteer().submit(html_parts, output_path, image_paths).result()
 
 def merge_pdfs(main_pdf_path, new_page_path):
     """
@@ -75,6 +327,9 @@ def merge_pdfs(main_pdf_path, new_page_path):
     main PDF. Otherwise, the new page is appended to the existing pages.
     The temporary new page file is always removed.
 
+    This still rewrites the whole document for one page; to add several
+    pages, use a PdfSession, which parses and writes the main PDF only once.
+
     Args:
         main_pdf_path (str): The path to the main (destination) PDF file.
         new_page_path (str): The path to the temporary single-page PDF to merge.
@@ -82,20 +337,21 @@ def merge_pdfs(main_pdf_path, new_page_path):
     Returns:
         bool: True on success, False on failure.
     """
+    # pypdf and Markdown are imported where they are used, so the UI process,
+    # which only merges, never loads Markdown or Pygments, and the render
+    # process never loads pypdf.
+    from pypdf import PdfWriter
+
     try:
-        if not os.path.exists(main_pdf_path):
+        # Clone the existing document as a whole instead of copying it page by
+        # page, then append only the new page.
+        try:
+            writer = PdfWriter(clone_from=main_pdf_path)
+        except FileNotFoundError:
             os.rename(new_page_path, main_pdf_path)
             return True
+        writer.append(new_page_path)
 
-        writer = PdfWriter()
-        reader_main = PdfReader(main_pdf_path)
-        for page in reader_main.pages:
-            writer.add_page(page)
-            
-        reader_new = PdfReader(new_page_path)
-        for page in reader_new.pages:
-            writer.add_page(page)
-            
         with open(main_pdf_path, "wb") as f:
             writer.write(f)
         return True
@@ -103,61 +359,134 @@ def merge_pdfs(main_pdf_path, new_page_path):
         print(f"Error merging PDFs: {e}")
         return False
     finally:
-        if os.path.exists(new_page_path):
+        try:
             os.remove(new_page_path)
+        except FileNotFoundError:
+            pass  # Renamed to become the main PDF
 
-def create_pdf_page(user_text, model_text, image_paths, output_path, show_headings=True, user_heading="User Message", model_heading="Model Response"):
+class PdfSession:
     """
-    Creates a single, styled PDF page from user and model text.
+    Keeps the main PDF open in memory while new pages are appended to it.
 
-    This function generates an HTML file from the input text, applying CSS
-    styling and Markdown-to-HTML conversion. It then invokes a Node.js
-    script (using Puppeteer) to render this HTML into a PDF.
+    The existing document is parsed once when the session is created, and
+    append_page() only adds the new page to the in-memory writer. Nothing is
+    written to disk until write() is called, so adding N pages costs a single
+    parse and a single write instead of re-reading and rewriting the whole
+    document for every page as merge_pdfs() does.
+
+    Args:
+        main_pdf_path (str): The path to the main (destination) PDF file.
+            If it does not exist yet, the session starts with no pages.
+    """
+    def __init__(self, main_pdf_path):
+        self.main_pdf_path = main_pdf_path
+        self.dirty = False
+        from pypdf import PdfWriter  # Imported lazily, see merge_pdfs
+        try:
+            self._writer = PdfWriter(clone_from=main_pdf_path)
+        except FileNotFoundError:
+            self._writer = PdfWriter()
+
+    def append_page(self, new_page_path):
+        """
+        Appends a newly created PDF page to the session.
+
+        The temporary new page file is always removed.
+
+        Args:
+            new_page_path (str): The path to the temporary single-page PDF to append.
+
+        Returns:
+            bool: True on success, False on failure.
+        """
+        try:
+            self._writer.append(new_page_path)
+            self.dirty = True
+            return True
+        except Exception as e:
+            print(f"Error appending page: {e}")
+            return False
+        finally:
+            try:
+                os.remove(new_page_path)
+            except FileNotFoundError:
+                pass
+
+    def write(self):
+        """
+        Writes the session's pages to the main PDF file.
+
+        Returns:
+            bool: True on success, False on failure.
+        """
+        try:
+            with open(self.main_pdf_path, "wb") as f:
+                self._writer.write(f)
+            self.dirty = False
+            return True
+        except Exception as e:
+            print(f"Error writing PDF: {e}")
+            return False
+
+def _file_uri(path):
+    """Returns the absolute file:// URL of a local file."""
+    return Path(path).resolve().as_uri()
+
+def _build_turn(user_text, model_text, image_paths, show_headings, user_heading, model_heading):
+    """
+    Builds the body HTML for one conversation turn.
+
+    The HTML is returned in pieces rather than as one string, so a long
+    response is never copied into a bigger string (see _PuppeteerWorker.submit).
 
     Args:
         user_text (str): The text from the user message input.
         model_text (str): The text from the model response input.
         image_paths (list): A list of paths to the images to be added.
-        output_path (str): The path where the generated PDF page will be saved.
-        show_headings (bool, optional): If True, headings are included. Defaults to True.
-        user_heading (str, optional): The heading for the user section. Defaults to "User Message".
-        model_heading (str, optional): The heading for the model section. Defaults to "Model Response".
+        show_headings (bool): If True, headings are included.
+        user_heading (str): The heading for the user section.
+        model_heading (str): The heading for the model section.
 
     Returns:
-        bool: True if the PDF was created successfully, False otherwise.
+        list: The headings, converted Markdown and images of the turn, as
+        HTML strings in document order.
     """
-    temp_html_path = os.path.join(os.path.dirname(__file__), '_temp.html')
-    
-    try:
-        css_path = os.path.join(os.path.dirname(__file__), 'style.css')
-        with open(css_path, 'r', encoding='utf-8') as f:
-            css_content = f.read()
-
-        user_section = ""
-        if user_text:
-            if show_headings and user_heading:
-                user_section += f"<h1>{html.escape(user_heading)}</h1>"
-            user_text_html = markdown_to_html_final(user_text)
-            user_section += f"<div class='content'>{user_text_html}</div>"
-
-        model_section = ""
-        if model_text:
-            if show_headings and model_heading:
-                model_section += f"<h1>{html.escape(model_heading)}</h1>"
-            model_text_html = markdown_to_html_final(model_text)
-            model_section += f"<div class='content'>{model_text_html}</div>"
-
-        image_section = ""
-        if image_paths:
-            for image_path in image_paths:
-                mime_type, _ = mimetypes.guess_type(image_path)
-                if not mime_type:
-                    mime_type = "application/octet-stream"
-                with open(image_path, "rb") as image_file:
-                    encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-                image_section += f"<img src='data:{mime_type};base64,{encoded_string}'/>"
-
-        html_content = f"""
+    parts = []
+    if user_text:
+        if show_headings and user_heading:
+            parts.append(f"<h1>{html.escape(user_heading)}</h1>")
+        parts += ["<div class='content'>", markdown_to_html_final(user_text), "</div>"]
+
+    if model_text:
+        if show_headings and model_heading:
+            parts.append(f"<h1>{html.escape(model_heading)}</h1>")
+        parts += ["<div class='content'>", markdown_to_html_final(model_text), "</div>"]
+
+    if image_paths:
+        for image_path in image_paths:
+            # Chromium reads the file itself, so the image is neither loaded
+            # here nor inflated by base64 inside the HTML.
+            image_uri = _file_uri(image_path)
+            parts.append(f"<img src='{image_uri}'/>")
+
+    return parts
+
+def _build_html(body_parts):
+    """
+    Wraps body HTML in the page template with styles, fonts and, if needed, MathJax.
+
+    Args:
+        body_parts (list): The HTML strings to place inside <body>, in order.
+
+    Returns:
+        list: The complete HTML document as a list of strings, in order.
+    """
+    # pymdownx.arithmatex marks every formula it finds with this class.
+    has_math = any('class="arithmatex"' in part for part in body_parts)
+    mathjax_script = MATHJAX_SCRIPT if has_math else ""
+
+    return [
+        f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -166,39 +495,116 @@ def create_pdf_page(user_text, model_text, image_paths, output_path, show_headin
             <link rel="preconnect" href="https://fonts.googleapis.com">
             <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
             <link href="https://fonts.googleapis.com/css2?family=Noto+Color+Emoji&family=Roboto:wght@400;700&display=swap" rel="stylesheet">
-            <script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
-            <style>
-                {css_content}
-            </style>
+            {mathjax_script}
+            <link rel="stylesheet" href="{_STYLE_CSS_URI}">
         </head>
         <body>
-            {user_section}
-            {model_section}
-            {image_section}
+            """,
+        *body_parts,
+        """
         </body>
         </html>
-        """
-        with open(temp_html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        script_path = os.path.join(os.path.dirname(__file__), 'generate_pdf.js')
-        subprocess.run(
-            ['node', script_path],
-            check=True,
-            cwd=os.path.dirname(__file__)
-        )
+        """,
+    ]
 
-        os.rename(os.path.join(os.path.dirname(__file__), '_temp_page.pdf'), output_path)
+def create_pdf_page(user_text, model_text, image_paths, output_path, show_headings=True, user_heading="User Message", model_heading="Model Response"):
+    """
+    Creates a single, styled PDF page from user and model text.
+
+    This function generates an HTML document from the input text, applying
+    CSS styling and Markdown-to-HTML conversion. It then sends it to the
+    long-running Node.js worker (using Puppeteer) to render into a PDF.
+
+    Args:
+        user_text (str): The text from the user message input.
+        model_text (str): The text from the model response input.
+        image_paths (list): A list of paths to the images to be added.
+        output_path (str): The path where the generated PDF page will be saved.
+        show_headings (bool, optional): If True, headings are included. Defaults to True.
+        user_heading (str, optional): The heading for the user section. Defaults to "User Message".
+        model_heading (str, optional): The heading for the model section. Defaults to "Model Response".
+
+    Returns:
+        bool: True if the PDF was created successfully, False otherwise.
+    """
+    try:
+        body_parts = _build_turn(user_text, model_text, image_paths, show_headings, user_heading, model_heading)
+        _render_pdf(_build_html(body_parts), output_path, image_paths or ())
 
         print(f"Successfully created PDF page at: {output_path}")
         return True
 
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+    except (RuntimeError, OSError) as e:
+        print(f"Error calling Puppeteer script: {e}")
+        return False
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return False
+
+def create_pdf_pages(pages, show_headings=True, user_heading="User Message", model_heading="Model Response", max_workers=PAGE_WORKERS):
+    """
+    Creates several separate PDF pages concurrently.
+
+    Each page is built and rendered on its own thread; the Puppeteer worker
+    prints them in parallel tabs of its one browser, so throughput grows with
+    the number of pages in flight until the CPU is saturated.
+
+    Args:
+        pages (iterable): (user_text, model_text, image_paths, output_path) tuples.
+            Every output_path must be unique.
+        show_headings (bool, optional): If True, headings are included. Defaults to True.
+        user_heading (str, optional): The heading for the user sections. Defaults to "User Message".
+        model_heading (str, optional): The heading for the model sections. Defaults to "Model Response".
+        max_workers (int, optional): How many pages to render at once. Defaults to PAGE_WORKERS.
+
+    Returns:
+        list: One bool per page, in order: True if that page was created successfully.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                create_pdf_page, user_text, model_text, image_paths, output_path,
+                show_headings, user_heading, model_heading
+            )
+            for user_text, model_text, image_paths, output_path in pages
+        ]
+        return [future.result() for future in futures]
+
+def create_pdf_document(turns, output_path, show_headings=True, user_heading="User Message", model_heading="Model Response"):
+    """
+    Creates a multi-page PDF from several conversation turns in one render.
+
+    All turns go into a single HTML document, one <section class="turn"> each,
+    and style.css starts every turn after the first on a new page. Puppeteer
+    prints the whole document in one go, so there is one render call and no
+    merging, compared with calling create_pdf_page() and merge_pdfs() per turn.
+
+    Args:
+        turns (iterable): (user_text, model_text, image_paths) tuples, in order.
+        output_path (str): The path where the generated PDF will be saved.
+        show_headings (bool, optional): If True, headings are included. Defaults to True.
+        user_heading (str, optional): The heading for the user sections. Defaults to "User Message".
+        model_heading (str, optional): The heading for the model sections. Defaults to "Model Response".
+
+    Returns:
+        bool: True if the PDF was created successfully, False otherwise.
+    """
+    try:
+        body_parts = []
+        all_image_paths = []
+        for user_text, model_text, image_paths in turns:
+            body_parts.append("<section class='turn'>")
+            body_parts += _build_turn(user_text, model_text, image_paths, show_headings, user_heading, model_heading)
+            body_parts.append("</section>")
+            all_image_paths += image_paths or ()
+        _render_pdf(_build_html(body_parts), output_path, all_image_paths)
+
+        print(f"Successfully created PDF document at: {output_path}")
+        return True
+
+    except (RuntimeError, OSError) as e:
         print(f"Error calling Puppeteer script: {e}")
         return False
     except Exception as e:
         print(f"An error occurred: {e}")
         return False
-    finally:
-        if os.path.exists(temp_html_path):
-            os.remove(temp_html_path)